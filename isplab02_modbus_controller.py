@@ -2,15 +2,60 @@
 """
 ISPLab02 Syringe Pump Controller (Drifton)
 Automation script using Modbus RTU protocol for ISPLab02 with touch screen
+
+Runs unchanged under PyPy, whose JIT compiles the pure-Python CRC and
+frame packing paths:
+
+    pypy3 -m pip install -r requirements.txt
+    pypy3 isplab02_modbus_controller.py
 """
 
 import serial
+import serial.rs485
 import time
 import struct
-from enum import Enum
-from typing import Optional, Tuple, List
+import asyncio
+import functools
+import selectors
+import signal
+import platform
+from array import array
+from enum import Enum, IntEnum
+from typing import Optional, Tuple, List, Dict, Union
 import logging
 
+# C extensions go through PyPy's slow cpyext layer, so under PyPy the
+# optional accelerators are skipped in favour of the JIT-compiled Python paths
+_PYPY = platform.python_implementation() == 'PyPy'
+
+_cython_crc16 = _fastcrc_modbus = None
+if not _PYPY:
+    try:
+        # Cython extension built from modbus_crc.pyx (python setup.py build_ext --inplace)
+        from modbus_crc import calculate_crc16 as _cython_crc16
+    except ImportError:
+        pass
+    
+    try:
+        # Compiled CRC implementation; the table below is the pure-Python fallback
+        from fastcrc.crc16 import modbus as _fastcrc_modbus
+    except ImportError:
+        pass
+
+try:
+    import serial_asyncio
+except ImportError:
+    serial_asyncio = None
+
+try:
+    from termios import error as _TermiosError
+except ImportError:  # Windows
+    _TermiosError = OSError
+
+# Errors pyserial raises when a port rejects RS-485 settings
+_RS485_ERRORS = (ValueError, NotImplementedError, OSError, _TermiosError,
+                 serial.SerialException)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -24,25 +69,125 @@ class PumpMode(Enum):
     WITHDRAWAL_INFUSION = 4
 
 
+class Register(IntEnum):
+    """Modbus register addresses (estimated - adjust based on actual documentation)"""
+    MODE = 0x0001           # Working mode register
+    FLOW_RATE = 0x0010      # Flow rate register
+    VOLUME = 0x0020         # Volume register
+    SYRINGE_DIA = 0x0030    # Syringe diameter register
+    START_STOP = 0x0040     # Start/Stop control register
+    STATUS = 0x0050         # Status register
+    DIRECTION = 0x0060      # Direction register
+    LINEAR_SPEED = 0x0070   # Linear speed register
+
+
+def _build_crc16_table() -> array:
+    """Precompute the 256-entry lookup table for the Modbus CRC16 (poly 0xA001)"""
+    table = array('H')
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            # -(crc & 1) is all ones when the low bit is set, so no branch is needed
+            crc = (crc >> 1) ^ (0xA001 & -(crc & 1))
+        table.append(crc)
+    return table
+
+
+CRC_TABLE = _build_crc16_table()
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy_crc_table():
+    """Import numpy on first use; returns (numpy, CRC table as uint16 array) or None"""
+    if _PYPY:
+        return None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy, numpy.frombuffer(CRC_TABLE, dtype=numpy.uint16)
+
+
+# Below this many frames the per-frame CRC is faster than numpy's call overhead;
+# a compiled per-frame CRC keeps up with numpy for longer than the table does
+if _cython_crc16 is not None or _fastcrc_modbus is not None:
+    _CRC_VECTOR_MIN_FRAMES = 128
+else:
+    _CRC_VECTOR_MIN_FRAMES = 64
+
+# Precompiled frame layouts (avoids re-parsing format strings on every frame)
+_FC3_FC6 = struct.Struct('>BBHH')    # slave, function, address, count/value
+_FC16 = struct.Struct('>BBHHB')      # slave, function, address, count, byte count
+_CRC = struct.Struct('<H')
+_REGISTER = struct.Struct('>H')
+
+
 class ModbusRTU:
     """Modbus RTU protocol implementation for ISPLab02"""
     
     @staticmethod
-    def calculate_crc16(data: bytes) -> int:
-        """Calculate Modbus CRC16"""
+    def calculate_crc16(data: Union[bytes, bytearray, memoryview]) -> int:
+        """Calculate Modbus CRC16 of any byte buffer (one table lookup per byte)"""
+        if _cython_crc16 is not None:
+            return _cython_crc16(data)
+        if _fastcrc_modbus is not None:
+            return _fastcrc_modbus(bytes(data))
+        
+        table = CRC_TABLE  # local binding keeps the loop on LOAD_FAST
         crc = 0xFFFF
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x0001:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc >>= 1
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
         return crc
     
+    @staticmethod
+    def calculate_crc16_many(frames: List[bytes]) -> List[int]:
+        """
+        Calculate Modbus CRC16 for a batch of frames
+        
+        Equal-length frames are laid out as one (N, length) uint8 array and
+        the CRC of every frame is advanced a byte column at a time with
+        numpy; otherwise each frame goes through calculate_crc16.
+        """
+        vectorized = None
+        if (len(frames) >= _CRC_VECTOR_MIN_FRAMES
+                and len({len(frame) for frame in frames}) == 1):
+            vectorized = _numpy_crc_table()
+        if vectorized is None:
+            return [ModbusRTU.calculate_crc16(frame) for frame in frames]
+        
+        np, table = vectorized
+        buf = np.frombuffer(b''.join(frames), dtype=np.uint8).reshape(len(frames), -1)
+        crc = np.full(len(frames), 0xFFFF, dtype=np.uint16)
+        for column in buf.T:
+            crc = (crc >> 8) ^ table[(crc ^ column) & 0xFF]
+        return crc.tolist()
+    
+    @staticmethod
+    def response_length(function_code: int, count: int = 1) -> int:
+        """
+        Length of the normal (non-exception) response to a request
+        
+        Args:
+            function_code: Modbus function of the request
+            count: Number of registers read (function 3 only)
+        """
+        if function_code == 3:  # slave, fc, byte count, data, CRC
+            return 5 + 2 * count
+        if function_code in (6, 16):  # slave, fc, address, value/count, CRC
+            return 8
+        raise ValueError(f"Unsupported function code: {function_code}")
+    
+    @staticmethod
+    def frame_gap(baudrate: int) -> float:
+        """Minimum bus silence between frames (3.5 character times) in seconds"""
+        if baudrate > 19200:
+            return 0.00175  # fixed value the Modbus spec mandates above 19200 baud
+        return 3.5 * 11 / baudrate  # 11 bits per character (start, 8 data, parity, stop)
+    
     @staticmethod
     def build_request(slave_id: int, function_code: int, register_addr: int, 
-                     value: int = None, count: int = 1) -> bytes:
+                     value: int = None, count: int = 1,
+                     values: Optional[List[int]] = None) -> bytes:
         """
         Build Modbus RTU request frame
         
@@ -52,30 +197,70 @@ class ModbusRTU:
             register_addr: Starting register address
             value: Value to write (for write functions)
             count: Number of registers to read
+            values: Consecutive register values to write (function 16)
         """
         if function_code == 3:  # Read holding registers
-            data = struct.pack('>BBH H', slave_id, function_code, register_addr, count)
+            data = _FC3_FC6.pack(slave_id, function_code, register_addr, count)
         elif function_code == 6:  # Write single register
-            data = struct.pack('>BBH H', slave_id, function_code, register_addr, value)
+            data = _FC3_FC6.pack(slave_id, function_code, register_addr, value)
         elif function_code == 16:  # Write multiple registers
-            # For simplicity, assuming single register write
-            byte_count = 2
-            data = struct.pack('>BBH HBH', slave_id, function_code, register_addr, 
-                             1, byte_count, value)
+            if values is None:
+                values = [value]
+            if not 1 <= len(values) <= 123:
+                raise ValueError(f"Function 16 writes 1-123 registers, got {len(values)}")
+            data = _FC16.pack(slave_id, function_code, register_addr,
+                              len(values), 2 * len(values))
+            data += struct.pack(f'>{len(values)}H', *values)
         else:
             raise ValueError(f"Unsupported function code: {function_code}")
         
         crc = ModbusRTU.calculate_crc16(data)
-        return data + struct.pack('<H', crc)
+        return data + _CRC.pack(crc)
     
     @staticmethod
-    def parse_response(response: bytes) -> Optional[int]:
-        """Parse Modbus RTU response"""
+    def build_into(buf: Union[bytearray, memoryview], slave_id: int, function_code: int,
+                   register_addr: int, value: int) -> int:
+        """
+        Build a function 3 or 6 request frame in place
+        
+        Args:
+            buf: Writable buffer of at least 8 bytes
+            slave_id: Slave device ID
+            function_code: 3 (read holding registers) or 6 (write single)
+            register_addr: Register address
+            value: Register count (function 3) or value (function 6)
+            
+        Returns:
+            Frame length written to buf
+        """
+        if function_code not in (3, 6):
+            raise ValueError(f"Unsupported function code: {function_code}")
+        
+        view = buf if type(buf) is memoryview else memoryview(buf)
+        _FC3_FC6.pack_into(view, 0, slave_id, function_code, register_addr, value)
+        _CRC.pack_into(view, 6, ModbusRTU.calculate_crc16(view[:6]))
+        return 8
+    
+    @staticmethod
+    def parse_response(response: bytes, request: Optional[bytes] = None) -> Optional[int]:
+        """
+        Parse Modbus RTU response
+        
+        Args:
+            response: Received frame
+            request: Request the response answers; replies from another slave
+                     or for another function code are rejected
+        """
         if len(response) < 5:
             return None
         
+        if request is not None and (response[0] != request[0]
+                                    or response[1] & 0x7F != request[1]):
+            logger.error("Response does not match request")
+            return None
+        
         # Check CRC
-        received_crc = struct.unpack('<H', response[-2:])[0]
+        received_crc = _CRC.unpack_from(response, len(response) - 2)[0]
         calculated_crc = ModbusRTU.calculate_crc16(response[:-2])
         
         if received_crc != calculated_crc:
@@ -86,31 +271,67 @@ class ModbusRTU:
         function_code = response[1]
         if function_code == 3:  # Read response
             if len(response) >= 7:
-                return struct.unpack('>H', response[3:5])[0]
+                return _REGISTER.unpack_from(response, 3)[0]
         elif function_code == 6:  # Write single register response
             if len(response) >= 8:
-                return struct.unpack('>H', response[4:6])[0]
+                return _REGISTER.unpack_from(response, 4)[0]
+        elif function_code == 16:  # Write multiple registers response (count written)
+            if len(response) >= 8:
+                return _REGISTER.unpack_from(response, 4)[0]
         
         return None
+    
+    @staticmethod
+    def parse_registers(response: bytes, request: Optional[bytes] = None) -> Optional[List[int]]:
+        """Parse every register value from a read holding registers response"""
+        if len(response) < 5 or response[1] != 3:
+            return None
+        
+        if request is not None and response[0] != request[0]:
+            logger.error("Response does not match request")
+            return None
+        
+        received_crc = _CRC.unpack_from(response, len(response) - 2)[0]
+        if received_crc != ModbusRTU.calculate_crc16(response[:-2]):
+            logger.error("CRC check failed")
+            return None
+        
+        byte_count = response[2]
+        if len(response) != byte_count + 5:
+            return None
+        return list(struct.unpack(f'>{byte_count // 2}H', response[3:3 + byte_count]))
+
+
+def _contiguous_runs(addresses: List[int]) -> List[List[int]]:
+    """Split register addresses into sorted runs of adjacent addresses"""
+    runs = []
+    for addr in sorted(set(addresses)):
+        if runs and addr == runs[-1][-1] + 1:
+            runs[-1].append(addr)
+        else:
+            runs.append([addr])
+    return runs
+
+
+def _resolve_register(register: Union[Register, str]) -> Optional[Register]:
+    """Return the Register for a member or a legacy register name"""
+    if type(register) is Register:
+        return register
+    member = Register.__members__.get(register)
+    if member is None:
+        logger.error(f"Unknown register: {register}")
+    return member
 
 
 class ISPLab02ModbusController:
     """Controller class for ISPLab02 Syringe Pump using Modbus RTU"""
     
-    # Modbus register addresses (estimated - adjust based on actual documentation)
-    REGISTERS = {
-        'MODE': 0x0001,           # Working mode register
-        'FLOW_RATE': 0x0010,      # Flow rate register
-        'VOLUME': 0x0020,         # Volume register
-        'SYRINGE_DIA': 0x0030,    # Syringe diameter register
-        'START_STOP': 0x0040,     # Start/Stop control register
-        'STATUS': 0x0050,         # Status register
-        'DIRECTION': 0x0060,      # Direction register
-        'LINEAR_SPEED': 0x0070,   # Linear speed register
-    }
+    # Deprecated: register names mapped to Register members, kept for
+    # callers that still pass names as strings
+    REGISTERS = dict(Register.__members__)
     
     def __init__(self, port: str = '/dev/tty.usbserial', 
-                 baudrate: int = 9600, slave_id: int = 1):
+                 baudrate: int = 9600, slave_id: int = 1, rs485: bool = False):
         """
         Initialize pump controller
         
@@ -118,15 +339,36 @@ class ISPLab02ModbusController:
             port: Serial port
             baudrate: Communication speed (typically 9600 for Modbus RTU)
             slave_id: Modbus slave ID (default 1)
+            rs485: Let the kernel driver handle RS-485 direction switching
+                   where supported (Linux TIOCSRS485); leave off for RS-232
         """
         self.port = port
         self.baudrate = baudrate
         self.slave_id = slave_id
+        self.rs485 = rs485
         self.serial_conn = None
         self.is_connected = False
         
+        # Transmit buffer that dynamic request frames are built into
+        self._txbuf = bytearray(8)
+        self._tx_view = memoryview(self._txbuf)
+        
+        # Frames for fixed commands, built once the slave ID is validated in connect()
+        self._frames = {}
+        
     def connect(self) -> bool:
         """Establish serial connection with pump"""
+        if not 1 <= self.slave_id <= 247:
+            logger.error(f"Invalid Modbus slave ID: {self.slave_id} (must be 1-247)")
+            return False
+        
+        # Fixed commands always produce the same frame, so build them once
+        self._frames = {
+            'start': ModbusRTU.build_request(self.slave_id, 6, Register.START_STOP, value=1),
+            'stop': ModbusRTU.build_request(self.slave_id, 6, Register.START_STOP, value=0),
+            'status_read': ModbusRTU.build_request(self.slave_id, 3, Register.STATUS, count=1),
+        }
+        
         try:
             self.serial_conn = serial.Serial(
                 port=self.port,
@@ -136,12 +378,45 @@ class ISPLab02ModbusController:
                 stopbits=serial.STOPBITS_ONE,
                 timeout=1.0
             )
-            self.is_connected = True
-            logger.info(f"Connected to ISPLab02 on {self.port} (Modbus RTU)")
-            return True
         except serial.SerialException as e:
             logger.error(f"Failed to connect: {e}")
             return False
+        
+        try:
+            if self.rs485:
+                self._enable_rs485_mode()
+        except Exception as e:
+            # Don't leave a half-configured port open behind a failed connect
+            self.serial_conn.close()
+            self.serial_conn = None
+            logger.error(f"Failed to connect: {e}")
+            return False
+        
+        self.is_connected = True
+        logger.info(f"Connected to ISPLab02 on {self.port} (Modbus RTU)")
+        return True
+    
+    def _enable_rs485_mode(self):
+        """
+        Hand RS-485 transmit/receive switching to the driver with zero delays
+        
+        Adapters that switch direction in hardware, and platforms without
+        kernel RS-485 support, reject this; the port is then left as is.
+        """
+        try:
+            self.serial_conn.rs485_mode = serial.rs485.RS485Settings(
+                rts_level_for_tx=True,
+                rts_level_for_rx=False,
+                delay_before_tx=0,
+                delay_before_rx=0
+            )
+        except _RS485_ERRORS as e:
+            logger.debug("RS-485 mode not available: %s", e)
+            try:
+                # Clear the setting so later reconfiguration doesn't retry it
+                self.serial_conn.rs485_mode = None
+            except _RS485_ERRORS:
+                pass
     
     def disconnect(self):
         """Close serial connection"""
@@ -150,72 +425,135 @@ class ISPLab02ModbusController:
             self.is_connected = False
             logger.info("Disconnected from pump")
     
-    def read_register(self, register_name: str) -> Optional[int]:
-        """Read a Modbus register"""
+    def _transaction(self, request: bytes, expected_len: int) -> Optional[int]:
+        """Send a prebuilt request frame and return the parsed response value"""
         if not self.is_connected:
             logger.error("Not connected to pump")
             return None
         
-        register_addr = self.REGISTERS.get(register_name)
-        if not register_addr:
-            logger.error(f"Unknown register: {register_name}")
-            return None
-        
         try:
-            # Build read request
-            request = ModbusRTU.build_request(self.slave_id, 3, register_addr, count=1)
-            
-            # Send request
+            # Drop stray bytes (e.g. a late reply) so they aren't taken as this response
+            self.serial_conn.reset_input_buffer()
             self.serial_conn.write(request)
-            logger.debug(f"Sent Modbus read request for {register_name}")
-            
-            # Read response
-            time.sleep(0.05)
-            response = self.serial_conn.read(256)
             
-            if response:
-                value = ModbusRTU.parse_response(response)
-                logger.debug(f"Read {register_name}: {value}")
-                return value
-                
+            # Read the header first so a 5 byte exception response ends the read early
+            header = self.serial_conn.read(2)
+            if len(header) < 2:
+                logger.error("Timed out waiting for Modbus response")
+                return None
+            remaining = 3 if header[1] & 0x80 else expected_len - 2
+            response = header + self.serial_conn.read(remaining)
+            return ModbusRTU.parse_response(response, request)
         except Exception as e:
-            logger.error(f"Error reading register: {e}")
+            logger.error(f"Error in Modbus transaction: {e}")
         
         return None
     
-    def write_register(self, register_name: str, value: int) -> bool:
-        """Write to a Modbus register"""
+    def read_register(self, register_name: Union[Register, str]) -> Optional[int]:
+        """Read a Modbus register (register names are accepted for compatibility)"""
         if not self.is_connected:
             logger.error("Not connected to pump")
-            return False
+            return None
+        
+        register = register_name
+        if type(register) is not Register:
+            register = _resolve_register(register)
+            if register is None:
+                return None
         
-        register_addr = self.REGISTERS.get(register_name)
-        if not register_addr:
-            logger.error(f"Unknown register: {register_name}")
+        try:
+            # Build read request
+            ModbusRTU.build_into(self._tx_view, self.slave_id, 3, register, 1)
+        except (struct.error, ValueError) as e:
+            logger.error(f"Error reading register: {e}")
+            return None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending Modbus read request for %s", register.name)
+        
+        value = self._transaction(self._txbuf, ModbusRTU.response_length(3))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Read %s: %s", register.name, value)
+        return value
+    
+    def write_register(self, register_name: Union[Register, str], value: int) -> bool:
+        """Write to a Modbus register (register names are accepted for compatibility)"""
+        if not self.is_connected:
+            logger.error("Not connected to pump")
             return False
         
+        register = register_name
+        if type(register) is not Register:
+            register = _resolve_register(register)
+            if register is None:
+                return False
+        
         try:
             # Build write request
-            request = ModbusRTU.build_request(self.slave_id, 6, register_addr, value=value)
-            
-            # Send request
-            self.serial_conn.write(request)
-            logger.debug(f"Sent Modbus write request for {register_name}: {value}")
-            
-            # Read response
-            time.sleep(0.05)
-            response = self.serial_conn.read(256)
-            
-            if response:
-                result = ModbusRTU.parse_response(response)
-                if result is not None:
-                    logger.info(f"Written {register_name}: {value}")
-                    return True
-                    
-        except Exception as e:
+            ModbusRTU.build_into(self._tx_view, self.slave_id, 6, register, value)
+        except (struct.error, ValueError) as e:
             logger.error(f"Error writing register: {e}")
+            return False
         
-        return False
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending Modbus write request for %s: %s", register.name, value)
+        
+        if self._transaction(self._txbuf, ModbusRTU.response_length(6)) is None:
+            return False
+        logger.info("Written %s: %s", register.name, value)
+        return True
+    
+    def write_registers(self, values: Dict[Union[Register, str], int]) -> bool:
+        """
+        Write several registers, one request per run of adjacent addresses
+        
+        Runs of two or more registers are sent as a single function 16
+        (write multiple) frame; isolated registers use function 6.
+        
+        Args:
+            values: Register (or register name) to value mapping
+        """
+        if not self.is_connected:
+            logger.error("Not connected to pump")
+            return False
+        
+        if not values:
+            logger.error("No registers to write")
+            return False
+        
+        by_addr = {}
+        for register, value in values.items():
+            register = _resolve_register(register)
+            if register is None:
+                return False
+            by_addr[register] = value
+        
+        # Build every frame first so an invalid value fails before anything is sent
+        requests = []
+        try:
+            for run in _contiguous_runs(list(by_addr)):
+                if len(run) == 1:
+                    request = ModbusRTU.build_request(self.slave_id, 6, run[0],
+                                                      value=by_addr[run[0]])
+                    expected_len = ModbusRTU.response_length(6)
+                else:
+                    request = ModbusRTU.build_request(self.slave_id, 16, run[0],
+                                                      values=[by_addr[addr] for addr in run])
+                    expected_len = ModbusRTU.response_length(16)
+                requests.append((run, request, expected_len))
+        except (struct.error, ValueError) as e:
+            logger.error(f"Error writing registers: {e}")
+            return False
+        
+        success = True
+        for run, request, expected_len in requests:
+            if self._transaction(request, expected_len) is None:
+                logger.error(f"Failed to write registers at 0x{run[0]:04X}")
+                success = False
+        
+        if success:
+            logger.info("Written %s", {Register(addr).name: value for addr, value in by_addr.items()})
+        return success
     
     def set_mode(self, mode: PumpMode) -> bool:
         """Set pump operating mode"""
@@ -228,7 +566,7 @@ class ISPLab02ModbusController:
         
         value = mode_values.get(mode)
         if value:
-            success = self.write_register('MODE', value)
+            success = self.write_register(Register.MODE, value)
             if success:
                 logger.info(f"Set mode to {mode.name}")
             return success
@@ -245,7 +583,7 @@ class ISPLab02ModbusController:
         
         # Convert to register value (may need scaling)
         register_value = int(rate_ul_min * 100)  # Example scaling
-        success = self.write_register('FLOW_RATE', register_value)
+        success = self.write_register(Register.FLOW_RATE, register_value)
         if success:
             logger.info(f"Set flow rate to {rate_ul_min} μL/min")
         return success
@@ -260,28 +598,64 @@ class ISPLab02ModbusController:
             return False
         
         register_value = int(speed_um_min)
-        success = self.write_register('LINEAR_SPEED', register_value)
+        success = self.write_register(Register.LINEAR_SPEED, register_value)
         if success:
             logger.info(f"Set linear speed to {speed_um_min} μm/min")
         return success
     
     def start(self) -> bool:
         """Start pump operation"""
-        success = self.write_register('START_STOP', 1)
+        success = self._transaction(self._frames.get('start'), ModbusRTU.response_length(6)) is not None
         if success:
             logger.info("Pump started")
         return success
     
     def stop(self) -> bool:
         """Stop pump operation"""
-        success = self.write_register('START_STOP', 0)
+        success = self._transaction(self._frames.get('stop'), ModbusRTU.response_length(6)) is not None
         if success:
             logger.info("Pump stopped")
         return success
     
     def get_status(self) -> Optional[int]:
         """Get pump status"""
-        return self.read_register('STATUS')
+        return self._transaction(self._frames.get('status_read'), ModbusRTU.response_length(3))
+    
+    def write_then_read(self, write_register: Union[Register, str], value: int,
+                        read_register: Union[Register, str]) -> Optional[int]:
+        """
+        Write a register and immediately read another (e.g. stop, then status)
+        
+        Both frames are built up front and the read is sent as soon as the
+        write is acknowledged and the bus has been silent for one frame gap.
+        The frames cannot share one write: an RTU slave would parse the two
+        back-to-back frames as a single corrupt frame, and on half-duplex
+        RS-485 the second request would collide with the first reply.
+        
+        Returns:
+            Value of read_register, or None if either transaction failed
+        """
+        write_register = _resolve_register(write_register)
+        read_register = _resolve_register(read_register)
+        if write_register is None or read_register is None:
+            return None
+        
+        try:
+            ModbusRTU.build_into(self._tx_view, self.slave_id, 6, write_register, value)
+            if read_register is Register.STATUS:
+                read_request = self._frames.get('status_read')
+            else:
+                read_request = ModbusRTU.build_request(self.slave_id, 3, read_register, count=1)
+        except (struct.error, ValueError) as e:
+            logger.error(f"Error writing register: {e}")
+            return None
+        
+        if self._transaction(self._txbuf, ModbusRTU.response_length(6)) is None:
+            logger.error(f"Failed to write {write_register.name}")
+            return None
+        
+        time.sleep(ModbusRTU.frame_gap(self.baudrate))
+        return self._transaction(read_request, ModbusRTU.response_length(3))
     
     def save_to_memory(self, slot: int) -> bool:
         """
@@ -315,6 +689,281 @@ class ISPLab02ModbusController:
         return True
 
 
+class ModbusMultiplexer:
+    """
+    Run one Modbus transaction on each of several pumps concurrently
+    
+    All requests are written up front and the replies are collected with a
+    selectors event loop (epoll on Linux, kqueue on macOS), so the wall time
+    is bounded by the slowest pump instead of the sum over pumps. Each pump
+    must be on its own serial port; ports without a file descriptor are
+    served sequentially.
+    """
+    
+    def __init__(self, timeout: float = 1.0):
+        """
+        Args:
+            timeout: Seconds to wait for all responses
+        """
+        self.timeout = timeout
+    
+    def transact(self, requests: List[Tuple[ISPLab02ModbusController, bytes, int]]
+                 ) -> List[Optional[int]]:
+        """
+        Send (pump, request frame, expected response length) transactions
+        
+        Requests that share a serial port are split into successive rounds,
+        since a port can only have one outstanding request.
+        
+        Returns:
+            Parsed response value per request, None on error or timeout
+        """
+        rounds = []
+        for index, (pump, _, _) in enumerate(requests):
+            port = self._port_key(pump)
+            for round_ in rounds:
+                if port not in round_:
+                    round_[port] = index
+                    break
+            else:
+                rounds.append({port: index})
+        
+        results = [None] * len(requests)
+        for round_ in rounds:
+            indices = list(round_.values())
+            for index, result in zip(indices, self._transact_round([requests[i] for i in indices])):
+                results[index] = result
+        return results
+    
+    @staticmethod
+    def _port_key(pump: ISPLab02ModbusController):
+        """Identify the serial port a pump talks through"""
+        try:
+            return pump.serial_conn.fileno()
+        except (AttributeError, OSError):
+            return id(pump.serial_conn) if pump.serial_conn is not None else id(pump)
+    
+    def _transact_round(self, requests: List[Tuple[ISPLab02ModbusController, bytes, int]]
+                        ) -> List[Optional[int]]:
+        """Run transactions concurrently; each request must use a different port"""
+        results = [None] * len(requests)
+        responses = {}
+        expected = {}
+        selector = selectors.DefaultSelector()
+        
+        try:
+            for index, (pump, request, expected_len) in enumerate(requests):
+                if not pump.is_connected:
+                    logger.error(f"Not connected to pump on {pump.port}")
+                    continue
+                
+                try:
+                    fd = pump.serial_conn.fileno()
+                except (AttributeError, OSError):
+                    results[index] = pump._transaction(request, expected_len)
+                    continue
+                
+                pump.serial_conn.reset_input_buffer()
+                pump.serial_conn.write(request)
+                responses[index] = bytearray()
+                expected[index] = expected_len
+                selector.register(fd, selectors.EVENT_READ, (index, pump))
+            
+            deadline = time.monotonic() + self.timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                for key, _ in selector.select(remaining):
+                    index, pump = key.data
+                    response = responses[index]
+                    waiting = max(pump.serial_conn.in_waiting, 1)
+                    response += pump.serial_conn.read(min(waiting, expected[index] - len(response)))
+                    
+                    if len(response) >= 2 and response[1] & 0x80:
+                        expected[index] = 5  # exception response
+                    if len(response) >= expected[index]:
+                        selector.unregister(key.fd)
+                        results[index] = ModbusRTU.parse_response(bytes(response),
+                                                                  requests[index][1])
+            
+            for key in list(selector.get_map().values()):
+                logger.error(f"Timed out waiting for pump on {key.data[1].port}")
+        except Exception as e:
+            logger.error(f"Error in multiplexed Modbus transaction: {e}")
+        finally:
+            selector.close()
+        
+        return results
+    
+    def read_register(self, pumps: List[ISPLab02ModbusController],
+                      register_name: Union[Register, str]) -> List[Optional[int]]:
+        """Read the same register from every pump"""
+        register_addr = _resolve_register(register_name)
+        if register_addr is None:
+            return [None] * len(pumps)
+        
+        requests = []
+        for pump in pumps:
+            ModbusRTU.build_into(pump._tx_view, pump.slave_id, 3, register_addr, 1)
+            requests.append((pump, pump._txbuf, ModbusRTU.response_length(3)))
+        return self.transact(requests)
+    
+    def get_status(self, pumps: List[ISPLab02ModbusController]) -> List[Optional[int]]:
+        """Get the status of every pump"""
+        expected_len = ModbusRTU.response_length(3)
+        return self.transact([(pump, pump._frames.get('status_read'), expected_len) for pump in pumps])
+
+
+class AsyncISPLab02ModbusController:
+    """asyncio controller for ISPLab02 using Modbus RTU (requires pyserial-asyncio)"""
+    
+    def __init__(self, port: str = '/dev/tty.usbserial', 
+                 baudrate: int = 9600, slave_id: int = 1, timeout: float = 1.0):
+        """
+        Initialize pump controller
+        
+        Args:
+            port: Serial port
+            baudrate: Communication speed (typically 9600 for Modbus RTU)
+            slave_id: Modbus slave ID (default 1)
+            timeout: Seconds to wait for a complete response
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.slave_id = slave_id
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.is_connected = False
+        self._lock = None
+    
+    async def connect(self) -> bool:
+        """Establish serial connection with pump"""
+        if serial_asyncio is None:
+            logger.error("pyserial-asyncio is not installed")
+            return False
+        
+        try:
+            self.reader, self.writer = await serial_asyncio.open_serial_connection(
+                url=self.port,
+                baudrate=self.baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_EVEN,
+                stopbits=serial.STOPBITS_ONE
+            )
+            self._lock = asyncio.Lock()
+            self.is_connected = True
+            logger.info(f"Connected to ISPLab02 on {self.port} (Modbus RTU, asyncio)")
+            return True
+        except serial.SerialException as e:
+            logger.error(f"Failed to connect: {e}")
+            return False
+    
+    async def disconnect(self):
+        """Close serial connection"""
+        if self.writer and self.is_connected:
+            self.writer.close()
+            self.is_connected = False
+            logger.info("Disconnected from pump")
+    
+    async def _transaction(self, request: bytes, expected_len: int) -> Optional[bytes]:
+        """Send one request and wait for exactly one response frame"""
+        async with self._lock:
+            # Drop stray bytes (e.g. a late reply) so they aren't taken as this response
+            await self._discard_input()
+            self.writer.write(request)
+            try:
+                return await asyncio.wait_for(self._read_frame(expected_len), self.timeout)
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                logger.error("Timed out waiting for Modbus response")
+                return None
+    
+    async def _discard_input(self):
+        """Discard buffered input until the line has been silent for one frame gap"""
+        gap = ModbusRTU.frame_gap(self.baudrate)
+        while True:
+            try:
+                if not await asyncio.wait_for(self.reader.read(256), gap):
+                    return  # end of stream
+            except asyncio.TimeoutError:
+                return
+    
+    async def _read_frame(self, expected_len: int) -> bytes:
+        """Read a response frame, stopping early on a 5 byte exception response"""
+        header = await self.reader.readexactly(2)
+        if header[1] & 0x80:
+            return header + await self.reader.readexactly(3)
+        return header + await self.reader.readexactly(expected_len - 2)
+    
+    async def read_register(self, register_name: Union[Register, str]) -> Optional[int]:
+        """Read a Modbus register"""
+        values = await self.read_many([register_name])
+        return values.get(register_name)
+    
+    async def read_many(self, registers: List[Union[Register, str]]
+                        ) -> Dict[Union[Register, str], Optional[int]]:
+        """
+        Read several registers, one request per run of adjacent addresses
+        
+        Modbus RTU allows a single outstanding request on the bus, so the
+        requests are issued back-to-back rather than pipelined.
+        """
+        values = dict.fromkeys(registers)
+        if not self.is_connected:
+            logger.error("Not connected to pump")
+            return values
+        
+        names_by_addr = {}
+        for name in registers:
+            register_addr = _resolve_register(name)
+            if register_addr is not None:
+                names_by_addr.setdefault(register_addr, []).append(name)
+        
+        for run in _contiguous_runs(list(names_by_addr)):
+            request = ModbusRTU.build_request(self.slave_id, 3, run[0], count=len(run))
+            response = await self._transaction(request, ModbusRTU.response_length(3, len(run)))
+            run_values = ModbusRTU.parse_registers(response, request) if response else None
+            if run_values is None or len(run_values) != len(run):
+                continue
+            for addr, value in zip(run, run_values):
+                for name in names_by_addr[addr]:
+                    values[name] = value
+        
+        logger.debug("Read registers: %s", values)
+        return values
+    
+    async def write_register(self, register_name: Union[Register, str], value: int) -> bool:
+        """Write to a Modbus register"""
+        if not self.is_connected:
+            logger.error("Not connected to pump")
+            return False
+        
+        register_addr = _resolve_register(register_name)
+        if register_addr is None:
+            return False
+        
+        request = ModbusRTU.build_request(self.slave_id, 6, register_addr, value=value)
+        response = await self._transaction(request, ModbusRTU.response_length(6))
+        if response and ModbusRTU.parse_response(response, request) is not None:
+            logger.info("Written %s: %s", register_addr.name, value)
+            return True
+        return False
+    
+    async def start(self) -> bool:
+        """Start pump operation"""
+        return await self.write_register(Register.START_STOP, 1)
+    
+    async def stop(self) -> bool:
+        """Stop pump operation"""
+        return await self.write_register(Register.START_STOP, 0)
+    
+    async def get_status(self) -> Optional[int]:
+        """Get pump status"""
+        return await self.read_register(Register.STATUS)
+
+
 def demo_automation():
     """
     Demo automation sequence showing all 4 working modes
@@ -378,11 +1027,9 @@ def demo_automation():
             print(f"Running for 3 seconds...")
             time.sleep(3)
             
-            pump.stop()
+            # Stop and read back status in one call
+            status = pump.write_then_read(Register.START_STOP, 0, Register.STATUS)
             print("Stopped")
-            
-            # Read status
-            status = pump.get_status()
             if status is not None:
                 print(f"Status: {status}")
         
@@ -401,6 +1048,43 @@ def demo_automation():
         pump.disconnect()
 
 
+async def _poll_status(pump: ISPLab02ModbusController, stop_requested: asyncio.Event,
+                       period: float = 1.0):
+    """Print pump status every period seconds until stop_requested is set"""
+    while not stop_requested.is_set():
+        status = await asyncio.to_thread(pump.get_status)
+        if status is not None:
+            print(f"Status: {status}", end='\r')
+        
+        try:
+            await asyncio.wait_for(stop_requested.wait(), period)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run_status_monitor(pump: ISPLab02ModbusController, period: float = 1.0):
+    """
+    Poll pump status on the event loop until Ctrl+C is pressed
+    
+    The serial transaction runs in a worker thread, so the loop stays free
+    for other tasks (e.g. more pumps) between polls.
+    """
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    try:
+        loop.add_signal_handler(signal.SIGINT, stop_requested.set)
+    except NotImplementedError:
+        pass  # Windows: Ctrl+C is raised as KeyboardInterrupt instead
+    
+    try:
+        await asyncio.create_task(_poll_status(pump, stop_requested, period))
+    finally:
+        try:
+            loop.remove_signal_handler(signal.SIGINT)
+        except NotImplementedError:
+            pass
+
+
 def custom_sequence():
     """
     Run a custom automation sequence with user parameters
@@ -452,11 +1136,9 @@ def custom_sequence():
         pump.start()
         
         print("Pump running. Press Ctrl+C to stop.")
-        while True:
-            time.sleep(1)
-            status = pump.get_status()
-            if status is not None:
-                print(f"Status: {status}", end='\r')
+        asyncio.run(_run_status_monitor(pump))
+        print("\nStopping pump...")
+        pump.stop()
             
     except KeyboardInterrupt:
         print("\nStopping pump...")
@@ -0,0 +1,39 @@
+# cython: language_level=3
+"""
+Compiled Modbus CRC16 for the ISPLab02 controller
+Build with (Cython>=3): python setup.py build_ext --inplace
+"""
+
+cimport cython
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_SIMPLE
+from cpython.bytes cimport PyBytes_AS_STRING, PyBytes_GET_SIZE
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline unsigned int _crc16(const unsigned char *data, Py_ssize_t length) noexcept nogil:
+    cdef unsigned int crc = 0xFFFF
+    cdef Py_ssize_t i
+    cdef int bit
+    for i in range(length):
+        crc ^= data[i]
+        for bit in range(8):
+            # Unsigned 0 - 1 wraps to all ones, selecting the polynomial without a branch
+            crc = (crc >> 1) ^ (0xA001 & (0 - (crc & 1)))
+    return crc
+
+
+cpdef unsigned int calculate_crc16(object data):
+    """Calculate Modbus CRC16 of bytes or any contiguous byte buffer"""
+    cdef Py_buffer view
+    cdef unsigned int crc
+    if type(data) is bytes:
+        # Skip buffer acquisition for the common case of an immutable frame
+        return _crc16(<const unsigned char *>PyBytes_AS_STRING(data), PyBytes_GET_SIZE(data))
+    # A raw Py_buffer is much cheaper to acquire than a typed memoryview
+    PyObject_GetBuffer(data, &view, PyBUF_SIMPLE)
+    try:
+        crc = _crc16(<const unsigned char *>view.buf, view.len)
+    finally:
+        PyBuffer_Release(&view)
+    return crc
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Build the optional Cython CRC16 extension (requires Cython>=3)
+Usage: python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+import Cython
+from Cython.Build import cythonize
+
+# modbus_crc.pyx relies on Cython 3 semantics (noexcept, and exceptions
+# propagating from cpdef functions returning C integers); under 0.29 a
+# buffer error would be swallowed and the CRC silently returned as 0
+if int(Cython.__version__.split('.')[0]) < 3:
+    raise SystemExit(f"modbus_crc requires Cython>=3, found {Cython.__version__}")
+
+setup(
+    name='modbus_crc',
+    setup_requires=['Cython>=3'],
+    ext_modules=cythonize('modbus_crc.pyx'),
+)
@@ -27,6 +27,17 @@ class PumpMode(Enum):
 class ISPLab02Controller:
     """Controller class for ISPLab02 Syringe Pump"""
     
+    # Pre-encoded command frames for fixed commands
+    _CMD_START = b'START\r\n'
+    _CMD_STOP = b'STOP\r\n'
+    _CMD_STATUS = b'STATUS\r\n'
+    _CMD_MODES = {
+        PumpMode.INFUSION: b'MODE:INF\r\n',
+        PumpMode.WITHDRAWAL: b'MODE:WDR\r\n',
+        PumpMode.INFUSION_WITHDRAWAL: b'MODE:I/W\r\n',
+        PumpMode.WITHDRAWAL_INFUSION: b'MODE:W/I\r\n'
+    }
+    
     def __init__(self, port: str = '/dev/tty.usbserial', baudrate: int = 9600):
         """
         Initialize pump controller
@@ -49,7 +60,7 @@ class ISPLab02Controller:
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=2.0
+                timeout=0.5
             )
             self.is_connected = True
             logger.info(f"Connected to pump on {self.port}")
@@ -72,6 +83,22 @@ class ISPLab02Controller:
         Args:
             command: Command string to send
             
+        Returns:
+            Response from pump or None if error
+        """
+        # Add carriage return and line feed if not present
+        if not command.endswith('\r\n'):
+            command += '\r\n'
+        
+        return self._send_raw(command.encode('ascii'))
+    
+    def _send_raw(self, frame: bytes) -> Optional[str]:
+        """
+        Send an already encoded, \\r\\n terminated command and read response
+        
+        Args:
+            frame: Encoded command bytes
+            
         Returns:
             Response from pump or None if error
         """
@@ -80,18 +107,14 @@ class ISPLab02Controller:
             return None
         
         try:
-            # Add carriage return and line feed if not present
-            if not command.endswith('\r\n'):
-                command += '\r\n'
-            
             # Send command
-            self.serial_conn.write(command.encode('ascii'))
-            logger.debug(f"Sent: {command.strip()}")
+            self.serial_conn.write(frame)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sent: %r", frame.strip())
             
-            # Read response
-            time.sleep(0.1)  # Small delay for pump to process
+            # Read response; readline() returns as soon as the \r\n terminator arrives
             response = self.serial_conn.readline().decode('ascii').strip()
-            logger.debug(f"Received: {response}")
+            logger.debug("Received: %s", response)
             
             return response
         except Exception as e:
@@ -105,16 +128,9 @@ class ISPLab02Controller:
         Args:
             mode: One of the four PumpMode options
         """
-        mode_commands = {
-            PumpMode.INFUSION: "MODE:INF",
-            PumpMode.WITHDRAWAL: "MODE:WDR", 
-            PumpMode.INFUSION_WITHDRAWAL: "MODE:I/W",
-            PumpMode.WITHDRAWAL_INFUSION: "MODE:W/I"
-        }
-        
-        command = mode_commands.get(mode)
+        command = self._CMD_MODES.get(mode)
         if command:
-            response = self.send_command(command)
+            response = self._send_raw(command)
             if response:
                 logger.info(f"Set mode to {mode.name}")
                 return True
@@ -131,8 +147,7 @@ class ISPLab02Controller:
             logger.error(f"Flow rate {rate_ul_min} out of range (0.001-127000 μL/min)")
             return False
         
-        command = f"RATE:{rate_ul_min:.3f}"
-        response = self.send_command(command)
+        response = self._send_raw(b'RATE:' + f'{rate_ul_min:.3f}'.encode('ascii') + b'\r\n')
         if response:
             logger.info(f"Set flow rate to {rate_ul_min} μL/min")
             return True
@@ -145,8 +160,7 @@ class ISPLab02Controller:
         Args:
             volume_ul: Target volume in microliters
         """
-        command = f"VOL:{volume_ul:.3f}"
-        response = self.send_command(command)
+        response = self._send_raw(b'VOL:' + f'{volume_ul:.3f}'.encode('ascii') + b'\r\n')
         if response:
             logger.info(f"Set volume to {volume_ul} μL")
             return True
@@ -159,8 +173,7 @@ class ISPLab02Controller:
         Args:
             diameter_mm: Inner diameter of syringe in millimeters
         """
-        command = f"DIA:{diameter_mm:.3f}"
-        response = self.send_command(command)
+        response = self._send_raw(b'DIA:' + f'{diameter_mm:.3f}'.encode('ascii') + b'\r\n')
         if response:
             logger.info(f"Set syringe diameter to {diameter_mm} mm")
             return True
@@ -168,7 +181,7 @@ class ISPLab02Controller:
     
     def start(self) -> bool:
         """Start pump operation"""
-        response = self.send_command("START")
+        response = self._send_raw(self._CMD_START)
         if response:
             logger.info("Pump started")
             return True
@@ -176,7 +189,7 @@ class ISPLab02Controller:
     
     def stop(self) -> bool:
         """Stop pump operation"""
-        response = self.send_command("STOP")
+        response = self._send_raw(self._CMD_STOP)
         if response:
             logger.info("Pump stopped")
             return True
@@ -184,7 +197,7 @@ class ISPLab02Controller:
     
     def get_status(self) -> Optional[str]:
         """Get pump status"""
-        return self.send_command("STATUS")
+        return self._send_raw(self._CMD_STATUS)
     
     def modify_flow_rate_online(self, new_rate_ul_min: float) -> bool:
         """
@@ -193,8 +206,8 @@ class ISPLab02Controller:
         Args:
             new_rate_ul_min: New flow rate in μL/min
         """
-        command = f"RATE_ONLINE:{new_rate_ul_min:.3f}"
-        response = self.send_command(command)
+        response = self._send_raw(
+            b'RATE_ONLINE:' + f'{new_rate_ul_min:.3f}'.encode('ascii') + b'\r\n')
         if response:
             logger.info(f"Modified flow rate online to {new_rate_ul_min} μL/min")
             return True